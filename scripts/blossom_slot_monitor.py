@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
+import base64
 import json
+import os
 import random
 import smtplib
+import string
 import subprocess
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from email.message import EmailMessage
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import requests
 
 STATE_PATH = Path('/home/manu/.openclaw/workspace/memory/blossom-slot-state.json')
+# Plaintext credentials: keep them outside the auto-synced workspace repo.
+SECRET_CACHE_PATH = Path.home() / '.cache' / 'openclaw' / 'secret-cache.json'
+SECRET_CACHE_TTL = 6 * 60 * 60
 SECRETS = {
     'user': 'blossom-foundation-username',
     'pass': 'blossom-foundation-password',
@@ -21,7 +30,8 @@ SECRETS = {
     'email_to': 'alert-email-to',
 }
 API_BASE = 'https://blossom-api.fly.dev'
-WATCH_SKUS = {'KY-SPRING26-1', 'KY-SPRING26-2'}
+ET = ZoneInfo('America/New_York')
+WATCH_SKUS = frozenset(map(sys.intern, ('KY-SPRING26-1', 'KY-SPRING26-2')))
 
 
 def get_secret(name: str) -> str:
@@ -32,6 +42,49 @@ def get_secret(name: str) -> str:
     return out.strip()
 
 
+def load_secret_cache():
+    try:
+        return json.loads(SECRET_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        # Missing or unreadable cache: refetch everything.
+        return {}
+
+
+def write_private(path: Path, text: str):
+    """Atomically replace `path` with `text`, creating the file 0600 from the start."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def save_secret_cache(cache):
+    SECRET_CACHE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    write_private(SECRET_CACHE_PATH, json.dumps(cache))
+
+
+def get_secrets(names: dict, ttl: int = SECRET_CACHE_TTL, refresh: bool = False) -> dict:
+    """Map each key of `names` to its secret value.
+
+    Values younger than `ttl` seconds come from the on-disk cache; the rest are
+    fetched concurrently and written back. `refresh` bypasses the cache.
+    """
+    cache = load_secret_cache()
+    now = time.time()
+    stale = [
+        n for n in set(names.values())
+        if refresh or n not in cache or now - cache[n]['fetched_at'] >= ttl
+    ]
+    if stale:
+        with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+            for name, value in zip(stale, pool.map(get_secret, stale)):
+                cache[name] = {'value': value, 'fetched_at': now}
+        save_secret_cache(cache)
+    return {key: cache[name]['value'] for key, name in names.items()}
+
+
 def load_state():
     if STATE_PATH.exists():
         return json.loads(STATE_PATH.read_text())
@@ -44,32 +97,55 @@ def load_state():
 
 
 def save_state(state):
+    # The state holds the cached bearer token, so it gets the same 0600 treatment.
     STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(json.dumps(state, indent=2))
+    write_private(STATE_PATH, json.dumps(state, indent=2))
 
 
 def in_window_utc_now_for_et() -> bool:
-    out = subprocess.check_output(['bash', '-lc', 'TZ=America/New_York date +%H:%M'], text=True).strip()
-    hh, _mm = map(int, out.split(':'))
+    hh = datetime.now(ET).hour
     return 5 <= hh <= 23  # 5:00 AM through 11:59 PM ET
 
 
-def fetch_retreats(username: str, password: str):
-    s = requests.Session()
-    r = s.post(f'{API_BASE}/auth/jwt/login', data={'username': username, 'password': password}, timeout=30)
+def jwt_exp(token: str):
+    """Return the unverified `exp` claim of a JWT, or None if it can't be read."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def login(session, username: str, password: str) -> str:
+    r = session.post(f'{API_BASE}/auth/jwt/login', data={'username': username, 'password': password}, timeout=30)
     r.raise_for_status()
-    token = r.json().get('access_token')
-    s.headers.update({'Authorization': f'Bearer {token}'})
+    return r.json().get('access_token')
+
+
+def get_access_token(session, state, secrets, now_ts: int, refresh: bool = False) -> str:
+    """Reuse the JWT cached in `state` until a minute before it expires, else log in again."""
+    token = state.get('access_token')
+    if refresh or not token or now_ts >= (state.get('access_token_exp') or 0) - 60:
+        token = login(session, secrets['user'], secrets['pass'])
+        state['access_token'] = token
+        state['access_token_exp'] = jwt_exp(token)
+    return token
 
-    rr = s.get(f'{API_BASE}/retreats', timeout=30)
+
+def fetch_retreats(session, token: str):
+    rr = session.get(f'{API_BASE}/retreats', headers={'Authorization': f'Bearer {token}'}, timeout=30)
     rr.raise_for_status()
     data = rr.json()
 
     normalized = []
     for item in data:
+        sku = item.get('sku')
+        if isinstance(sku, str):
+            sku = sys.intern(sku)
         normalized.append({
             'title': item.get('title'),
-            'sku': item.get('sku'),
+            'sku': sku,
             'has_availability': bool(item.get('has_availability')),
             'is_registration_open': bool(item.get('is_registration_open')),
             'start_date': item.get('start_date'),
@@ -82,48 +158,54 @@ def is_open(item):
     return item.get('has_availability') and item.get('is_registration_open')
 
 
-def render_email_html(checked_at_utc: str, open_any, open_watched):
-    def li(item):
-        return f"<li><strong>{item['title']}</strong> <span style='color:#666'>(SKU: {item.get('sku','-')})</span></li>"
-
-    if open_any:
-        all_open_html = '\n'.join(li(x) for x in open_any)
-    else:
-        all_open_html = "<li>None open right now</li>"
-
-    if open_watched:
-        watched_html = '\n'.join(li(x) for x in open_watched)
-        watched_block = f"""
+LI_TEMPLATE = "<li><strong>{title}</strong> <span style='color:#666'>(SKU: {sku})</span></li>"
+WATCHED_BLOCK_TEMPLATE = string.Template("""
         <div style='padding:10px 12px;border:1px solid #d1fae5;background:#ecfdf5;border-radius:8px;margin-top:12px;'>
           <div style='font-weight:700;color:#065f46;'>⭐ Kriya 1/2 opening detected</div>
-          <ul style='margin:8px 0 0 18px;padding:0;'>{watched_html}</ul>
+          <ul style='margin:8px 0 0 18px;padding:0;'>$watched_html</ul>
         </div>
-        """
-    else:
-        watched_block = """
+        """)
+NO_WATCHED_BLOCK = """
         <div style='padding:10px 12px;border:1px solid #e5e7eb;background:#f9fafb;border-radius:8px;margin-top:12px;'>
           <div style='font-weight:700;color:#374151;'>Kriya Yoga 1/2</div>
           <div style='margin-top:4px;color:#4b5563;'>No Kriya 1/2 openings detected in this check.</div>
         </div>
         """
-
-    return f"""
+EMAIL_TEMPLATE = string.Template("""
     <html>
       <body style='font-family:Arial,Helvetica,sans-serif;line-height:1.45;color:#111827;'>
         <div style='max-width:620px;margin:0 auto;border:1px solid #e5e7eb;border-radius:10px;padding:16px;'>
           <h2 style='margin:0 0 6px 0;'>Blossom Registration Update</h2>
-          <div style='color:#6b7280;font-size:13px;'>Checked at (UTC): {checked_at_utc}</div>
+          <div style='color:#6b7280;font-size:13px;'>Checked at (UTC): $checked_at</div>
 
           <h3 style='margin:16px 0 8px 0;'>Currently Open Retreats</h3>
           <ul style='margin:0 0 8px 18px;padding:0;'>
-            {all_open_html}
+            $all_open_html
           </ul>
 
-          {watched_block}
+          $watched_block
         </div>
       </body>
     </html>
-    """
+    """)
+
+
+def email_li(item):
+    return LI_TEMPLATE.format(title=item['title'], sku=item.get('sku', '-'))
+
+
+def render_email_html(checked_at_utc: str, open_li, watched_li):
+    """Fill the email template from pre-rendered `<li>` fragments."""
+    if watched_li:
+        watched_block = WATCHED_BLOCK_TEMPLATE.substitute(watched_html='\n'.join(watched_li))
+    else:
+        watched_block = NO_WATCHED_BLOCK
+
+    return EMAIL_TEMPLATE.substitute(
+        checked_at=checked_at_utc,
+        all_open_html='\n'.join(open_li) or "<li>None open right now</li>",
+        watched_block=watched_block,
+    )
 
 
 def send_email(smtp_host, smtp_port, smtp_user, smtp_pass, to_addr, subject, body_text, body_html):
@@ -156,22 +238,39 @@ def main():
         print(json.dumps({'ok': True, 'skipped': 'not_due_yet', 'checked_at': now, 'next_check_after': next_check_after}))
         return
 
-    time.sleep(random.randint(20, 140))
-
-    username = get_secret(SECRETS['user'])
-    password = get_secret(SECRETS['pass'])
-    retreats = fetch_retreats(username, password)
-
-    open_any = [x for x in retreats if is_open(x)]
-    open_watched = [x for x in open_any if x.get('sku') in WATCH_SKUS]
+    secrets = get_secrets(SECRETS)
+    with requests.Session() as session:
+        try:
+            retreats = fetch_retreats(session, get_access_token(session, state, secrets, now_ts))
+        except requests.HTTPError as exc:
+            if exc.response is None or exc.response.status_code != 401:
+                raise
+            # The cached token or credentials may be stale; refresh both and retry once.
+            secrets.update(get_secrets({'user': SECRETS['user'], 'pass': SECRETS['pass']}, refresh=True))
+            token = get_access_token(session, state, secrets, now_ts, refresh=True)
+            retreats = fetch_retreats(session, token)
+
+    # One pass over the retreats builds every artifact below: the JSON summary,
+    # the plain-text lines, and the HTML list items.
+    open_any, open_watched = [], []
+    open_text, watched_text = [], []
+    open_li, watched_li = [], []
+    for x in retreats:
+        if not is_open(x):
+            continue
+        sku = x.get('sku')
+        summary = {'title': x['title'], 'sku': sku}
+        line = f"- {x['title']} (SKU: {sku})"
+        li = email_li(x)
+        open_any.append(summary)
+        open_text.append(line)
+        open_li.append(li)
+        if sku in WATCH_SKUS:
+            open_watched.append(summary)
+            watched_text.append(line)
+            watched_li.append(li)
     alert_triggered = len(open_watched) > 0 and not state.get('last_alert_open', False)
 
-    smtp_host = get_secret(SECRETS['smtp_host'])
-    smtp_port = get_secret(SECRETS['smtp_port'])
-    smtp_user = get_secret(SECRETS['smtp_user'])
-    smtp_pass = get_secret(SECRETS['smtp_pass'])
-    email_to = get_secret(SECRETS['email_to'])
-
     kriya_status = 'OPEN' if open_watched else 'NOT OPEN'
     subject = f'Kriya Yoga 1/2: {kriya_status} | Blossom registration update'
     if open_any:
@@ -182,39 +281,43 @@ def main():
         '',
         'Open retreats now:',
     ]
-    if open_any:
-        for x in open_any:
-            text_lines.append(f"- {x['title']} (SKU: {x.get('sku','-')})")
-    else:
-        text_lines.append('- None open right now')
-
-    if open_watched:
-        text_lines += ['', 'Kriya 1/2 OPEN:']
-        for x in open_watched:
-            text_lines.append(f"- {x['title']} (SKU: {x.get('sku','-')})")
+    text_lines += open_text or ['- None open right now']
+    if watched_text:
+        text_lines += ['', 'Kriya 1/2 OPEN:', *watched_text]
 
     body_text = '\n'.join(text_lines)
-    body_html = render_email_html(now, open_any, open_watched)
+    body_html = render_email_html(now, open_li, watched_li)
 
     email_sent = False
     # Alert only when watched Kriya Yoga slots are currently open.
     if open_watched:
-        send_email(smtp_host, smtp_port, smtp_user, smtp_pass, email_to, subject, body_text, body_html)
+        send_email(
+            secrets['smtp_host'],
+            secrets['smtp_port'],
+            secrets['smtp_user'],
+            secrets['smtp_pass'],
+            secrets['email_to'],
+            subject,
+            body_text,
+            body_html,
+        )
         email_sent = True
 
     state['last_alert_open'] = len(open_watched) > 0
     if alert_triggered:
         state['last_alert_at'] = now
     state['last_checked_at'] = now
-    state['next_check_after'] = now_ts + random.randint(23 * 60, 41 * 60)
+    # Jitter lives in the schedule rather than a sleep, so the process exits
+    # right away and later cron ticks skip as not_due_yet until it elapses.
+    state['next_check_after'] = now_ts + random.randint(23 * 60, 41 * 60) + random.randint(20, 140)
     save_state(state)
 
     print(json.dumps({
         'ok': True,
         'checked_at': now,
         'any_open': len(open_any) > 0,
-        'open_items': [{'title': x['title'], 'sku': x.get('sku')} for x in open_any],
-        'open_watched_items': [{'title': x['title'], 'sku': x.get('sku')} for x in open_watched],
+        'open_items': open_any,
+        'open_watched_items': open_watched,
         'alert_triggered': alert_triggered,
         'email_sent': email_sent,
     }))
@@ -11,22 +11,29 @@ Usage:
     python ontology.py list --type Person
     python ontology.py delete --id p_001
     python ontology.py validate
+    python ontology.py compact
 """
 
 import argparse
+import hashlib
 import json
+import os
 import uuid
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timezone
 from pathlib import Path
 
 DEFAULT_GRAPH_PATH = "memory/ontology/graph.jsonl"
 DEFAULT_SCHEMA_PATH = "memory/ontology/schema.yaml"
+SNAPSHOT_SUFFIX = ".snapshot"
+# Rewrite the snapshot once this many log bytes have accumulated after it.
+SNAPSHOT_REWRITE_BYTES = 64 * 1024
 
 
 def resolve_safe_path(
     user_path: str,
     *,
-    root: Path | None = None,
+    root: Path | str | None = None,
     must_exist: bool = False,
     label: str = "path",
 ) -> Path:
@@ -34,27 +41,24 @@ def resolve_safe_path(
     if not user_path or not user_path.strip():
         raise SystemExit(f"Invalid {label}: empty path")
 
-    safe_root = (root or Path.cwd()).resolve()
-    candidate = Path(user_path).expanduser()
-    if not candidate.is_absolute():
-        candidate = safe_root / candidate
+    safe_root = os.path.realpath(root if root is not None else os.getcwd())
+    # os.path.join keeps an absolute candidate as-is.
+    candidate = os.path.join(safe_root, os.path.expanduser(user_path))
 
     try:
-        resolved = candidate.resolve(strict=False)
+        resolved = os.path.realpath(candidate)
     except OSError as exc:
         raise SystemExit(f"Invalid {label}: {exc}") from exc
 
-    try:
-        resolved.relative_to(safe_root)
-    except ValueError:
+    if resolved != safe_root and not resolved.startswith(safe_root.rstrip(os.sep) + os.sep):
         raise SystemExit(
             f"Invalid {label}: must stay within workspace root '{safe_root}'"
         )
 
-    if must_exist and not resolved.exists():
+    if must_exist and not os.path.exists(resolved):
         raise SystemExit(f"Invalid {label}: file not found '{resolved}'")
 
-    return resolved
+    return Path(resolved)
 
 
 def generate_id(type_name: str) -> str:
@@ -64,6 +68,50 @@ def generate_id(type_name: str) -> str:
     return f"{prefix}_{suffix}"
 
 
+def replay_ops(data: bytes, entities: dict, relations: list) -> None:
+    """Apply JSONL-encoded operations to entities and relations in place."""
+    # Relations are keyed by insertion order so an unrelate drops every
+    # matching (from, rel, to) edge without rebuilding the whole list.
+    rel_by_seq = dict(enumerate(relations))
+    seqs_by_key = defaultdict(list)
+    for seq, rel in rel_by_seq.items():
+        seqs_by_key[(rel["from"], rel["rel"], rel["to"])].append(seq)
+    next_seq = len(relations)
+    
+    # json.loads accepts bytes, so no per-line decode or text-mode iteration is needed.
+    for line in data.splitlines():
+        if not line or line.isspace():
+            continue
+        record = json.loads(line)
+        op = record.get("op")
+        
+        if op == "create":
+            entity = record["entity"]
+            entities[entity["id"]] = entity
+        elif op == "update":
+            entity_id = record["id"]
+            if entity_id in entities:
+                entities[entity_id]["properties"].update(record.get("properties", {}))
+                entities[entity_id]["updated"] = record.get("timestamp")
+        elif op == "delete":
+            entity_id = record["id"]
+            entities.pop(entity_id, None)
+        elif op == "relate":
+            rel_by_seq[next_seq] = {
+                "from": record["from"],
+                "rel": record["rel"],
+                "to": record["to"],
+                "properties": record.get("properties", {})
+            }
+            seqs_by_key[(record["from"], record["rel"], record["to"])].append(next_seq)
+            next_seq += 1
+        elif op == "unrelate":
+            for seq in seqs_by_key.pop((record["from"], record["rel"], record["to"]), ()):
+                del rel_by_seq[seq]
+    
+    relations[:] = rel_by_seq.values()
+
+
 def load_graph(path: str) -> tuple[dict, list]:
     """Load entities and relations from graph file."""
     entities = {}
@@ -73,51 +121,194 @@ def load_graph(path: str) -> tuple[dict, list]:
     if not graph_path.exists():
         return entities, relations
     
-    with open(graph_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            record = json.loads(line)
-            op = record.get("op")
-            
-            if op == "create":
-                entity = record["entity"]
-                entities[entity["id"]] = entity
-            elif op == "update":
-                entity_id = record["id"]
-                if entity_id in entities:
-                    entities[entity_id]["properties"].update(record.get("properties", {}))
-                    entities[entity_id]["updated"] = record.get("timestamp")
-            elif op == "delete":
-                entity_id = record["id"]
-                entities.pop(entity_id, None)
-            elif op == "relate":
-                relations.append({
-                    "from": record["from"],
-                    "rel": record["rel"],
-                    "to": record["to"],
-                    "properties": record.get("properties", {})
-                })
-            elif op == "unrelate":
-                relations = [r for r in relations 
-                           if not (r["from"] == record["from"] 
-                                  and r["rel"] == record["rel"] 
-                                  and r["to"] == record["to"])]
+    replay_ops(graph_path.read_bytes(), entities, relations)
+    return entities, relations
+
+
+def snapshot_path(path: str) -> Path:
+    """Return the snapshot file that sits next to a graph file."""
+    return Path(f"{path}{SNAPSHOT_SUFFIX}")
+
+
+def _snapshot_anchor(f, offset: int) -> str:
+    """Hash the first `offset` log bytes, so an edit anywhere in them invalidates the snapshot.
+
+    Hashing is far cheaper than the JSON replay the snapshot saves.
+    """
+    f.seek(0)
+    digest = hashlib.sha1()
+    remaining = offset
+    while remaining:
+        chunk = f.read(min(remaining, 1 << 20))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, entities: dict, relations: list, offset: int, anchor: str) -> None:
+    """Atomically write the replayed state of the first `offset` log bytes."""
+    snap_file = snapshot_path(path)
+    # Per-process temp name: concurrent readers may all be rewriting the snapshot.
+    tmp_file = snap_file.with_name(f"{snap_file.name}.{os.getpid()}.tmp")
+    snapshot = {
+        "offset": offset,
+        "anchor": anchor,
+        "entities": entities,
+        "relations": relations,
+    }
+    try:
+        tmp_file.write_bytes(json.dumps(snapshot, separators=(",", ":")).encode())
+        os.replace(tmp_file, snap_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+def load_graph_cached(path: str) -> tuple[dict, list]:
+    """Load entities and relations from the snapshot plus any newer log ops.
+
+    Only the log bytes appended since the snapshot are replayed. The snapshot
+    is rewritten once that tail grows past SNAPSHOT_REWRITE_BYTES.
+    """
+    entities = {}
+    relations = []
+    
+    graph_path = Path(path)
+    if not graph_path.exists():
+        return entities, relations
+    
+    offset = 0
+    snap_file = snapshot_path(path)
+    with open(graph_path, "rb") as f:
+        if snap_file.exists():
+            try:
+                snapshot = json.loads(snap_file.read_bytes())
+                if (
+                    snapshot["offset"] <= os.fstat(f.fileno()).st_size
+                    and _snapshot_anchor(f, snapshot["offset"]) == snapshot["anchor"]
+                ):
+                    offset = snapshot["offset"]
+                    entities = snapshot["entities"]
+                    relations = snapshot["relations"]
+            except (ValueError, KeyError, TypeError):
+                pass
+        
+        f.seek(offset)
+        tail = f.read()
+        complete = tail.rfind(b"\n") + 1
+        replay_ops(tail[:complete], entities, relations)
+        
+        # Snapshots only ever cover newline-terminated ops.
+        if complete > SNAPSHOT_REWRITE_BYTES:
+            offset += complete
+            try:
+                write_snapshot(path, entities, relations, offset, _snapshot_anchor(f, offset))
+            except OSError:
+                # The snapshot is only a cache; a read must not fail because of it.
+                pass
+        
+        # A last line without a newline is either a hand edit or an append in
+        # progress: apply it if it parses, otherwise leave it for the next load.
+        unterminated = tail[complete:]
+        if unterminated.strip():
+            try:
+                json.loads(unterminated)
+            except ValueError:
+                pass
+            else:
+                replay_ops(unterminated, entities, relations)
     
     return entities, relations
 
 
-def append_op(path: str, record: dict):
-    """Append an operation to the graph file."""
+def compact_graph(path: str) -> dict:
+    """Rewrite the log as create/relate ops for the current state and snapshot it."""
+    graph_path = Path(path)
+    size_before = graph_path.stat().st_size if graph_path.exists() else 0
+    entities, relations = load_graph_cached(path)
+    
+    timestamp = datetime.now(timezone.utc).isoformat()
+    lines = []
+    for entity in entities.values():
+        lines.append(encode_op({"op": "create", "entity": entity, "timestamp": entity.get("created")}))
+    for rel in relations:
+        lines.append(encode_op({"op": "relate", **rel, "timestamp": timestamp}))
+    data = b"".join(lines)
+    
+    graph_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = graph_path.with_name(graph_path.name + ".tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, graph_path)
+    
+    with open(graph_path, "rb") as f:
+        write_snapshot(path, entities, relations, len(data), _snapshot_anchor(f, len(data)))
+    
+    return {
+        "entities": len(entities),
+        "relations": len(relations),
+        "bytes_before": size_before,
+        "bytes_after": len(data),
+    }
+
+
+def encode_op(record: dict) -> bytes:
+    """Encode an operation as one JSONL line."""
+    return json.dumps(record).encode() + b"\n"
+
+
+class GraphWriter:
+    """Keep the graph file open across many appends and fsync once on exit.
+
+    Usage:
+        with GraphWriter(graph_path) as writer:
+            for row in rows:
+                create_entity("Person", row, graph_path, writer=writer)
+
+    Writes are unbuffered, so reads made inside the block see earlier ops.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "ab", buffering=0)
+        return self
+
+    def append(self, record: dict) -> None:
+        self.file.write(encode_op(record))
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            os.fsync(self.file.fileno())
+        finally:
+            self.file.close()
+            self.file = None
+
+
+def append_op(path: str, record: dict, writer: GraphWriter | None = None):
+    """Append an operation to the graph file, or to `writer` when given."""
+    if writer is not None:
+        writer.append(record)
+        return
+    
     graph_path = Path(path)
     graph_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(graph_path, "a") as f:
-        f.write(json.dumps(record) + "\n")
+    with open(graph_path, "ab") as f:
+        f.write(encode_op(record))
 
 
-def create_entity(type_name: str, properties: dict, graph_path: str, entity_id: str = None) -> dict:
+def create_entity(
+    type_name: str,
+    properties: dict,
+    graph_path: str,
+    entity_id: str = None,
+    writer: GraphWriter | None = None,
+) -> dict:
     """Create a new entity."""
     entity_id = entity_id or generate_id(type_name)
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -131,20 +322,20 @@ def create_entity(type_name: str, properties: dict, graph_path: str, entity_id:
     }
     
     record = {"op": "create", "entity": entity, "timestamp": timestamp}
-    append_op(graph_path, record)
+    append_op(graph_path, record, writer)
     
     return entity
 
 
 def get_entity(entity_id: str, graph_path: str) -> dict | None:
     """Get entity by ID."""
-    entities, _ = load_graph(graph_path)
+    entities, _ = load_graph_cached(graph_path)
     return entities.get(entity_id)
 
 
 def query_entities(type_name: str, where: dict, graph_path: str) -> list:
     """Query entities by type and properties."""
-    entities, _ = load_graph(graph_path)
+    entities, _ = load_graph_cached(graph_path)
     results = []
     
     for entity in entities.values():
@@ -165,40 +356,49 @@ def query_entities(type_name: str, where: dict, graph_path: str) -> list:
 
 def list_entities(type_name: str, graph_path: str) -> list:
     """List all entities of a type."""
-    entities, _ = load_graph(graph_path)
+    entities, _ = load_graph_cached(graph_path)
     if type_name:
         return [e for e in entities.values() if e["type"] == type_name]
     return list(entities.values())
 
 
-def update_entity(entity_id: str, properties: dict, graph_path: str) -> dict | None:
+def update_entity(
+    entity_id: str, properties: dict, graph_path: str, writer: GraphWriter | None = None
+) -> dict | None:
     """Update entity properties."""
-    entities, _ = load_graph(graph_path)
+    entities, _ = load_graph_cached(graph_path)
     if entity_id not in entities:
         return None
     
     timestamp = datetime.now(timezone.utc).isoformat()
     record = {"op": "update", "id": entity_id, "properties": properties, "timestamp": timestamp}
-    append_op(graph_path, record)
+    append_op(graph_path, record, writer)
     
     entities[entity_id]["properties"].update(properties)
     entities[entity_id]["updated"] = timestamp
     return entities[entity_id]
 
 
-def delete_entity(entity_id: str, graph_path: str) -> bool:
+def delete_entity(entity_id: str, graph_path: str, writer: GraphWriter | None = None) -> bool:
     """Delete an entity."""
-    entities, _ = load_graph(graph_path)
+    entities, _ = load_graph_cached(graph_path)
     if entity_id not in entities:
         return False
     
     timestamp = datetime.now(timezone.utc).isoformat()
     record = {"op": "delete", "id": entity_id, "timestamp": timestamp}
-    append_op(graph_path, record)
+    append_op(graph_path, record, writer)
     return True
 
 
-def create_relation(from_id: str, rel_type: str, to_id: str, properties: dict, graph_path: str):
+def create_relation(
+    from_id: str,
+    rel_type: str,
+    to_id: str,
+    properties: dict,
+    graph_path: str,
+    writer: GraphWriter | None = None,
+):
     """Create a relation between entities."""
     timestamp = datetime.now(timezone.utc).isoformat()
     record = {
@@ -209,13 +409,13 @@ def create_relation(from_id: str, rel_type: str, to_id: str, properties: dict, g
         "properties": properties,
         "timestamp": timestamp
     }
-    append_op(graph_path, record)
+    append_op(graph_path, record, writer)
     return record
 
 
 def get_related(entity_id: str, rel_type: str, graph_path: str, direction: str = "outgoing") -> list:
     """Get related entities."""
-    entities, relations = load_graph(graph_path)
+    entities, relations = load_graph_cached(graph_path)
     results = []
     
     for rel in relations:
@@ -247,9 +447,68 @@ def get_related(entity_id: str, rel_type: str, graph_path: str, direction: str =
     return results
 
 
+def compile_type_schemas(type_schemas: dict) -> dict:
+    """Flatten each type schema into (required, forbidden, enums) for validation.
+
+    `enums` holds (field, allowed, allowed_set) triples; `allowed_set` is None
+    unless the allowed values are a list of hashable items.
+    """
+    compiled = {}
+    for type_name, type_schema in type_schemas.items():
+        type_schema = type_schema or {}
+        enums = []
+        for prop, allowed in type_schema.items():
+            if prop.endswith("_enum"):
+                allowed_set = None
+                if isinstance(allowed, list):
+                    try:
+                        allowed_set = frozenset(allowed)
+                    except TypeError:
+                        pass
+                enums.append((prop.replace("_enum", ""), allowed, allowed_set))
+        compiled[type_name] = (
+            tuple(type_schema.get("required", [])),
+            tuple(type_schema.get("forbidden_properties", [])),
+            tuple(enums),
+        )
+    return compiled
+
+
+def _enum_allows(value, allowed, allowed_set) -> bool:
+    if allowed_set is not None:
+        try:
+            return value in allowed_set
+        except TypeError:
+            pass
+    return value in allowed
+
+
+def iter_ops(path: str):
+    """Yield operation records from the graph file one line at a time."""
+    graph_path = Path(path)
+    if not graph_path.exists():
+        return
+    with open(graph_path, "rb") as f:
+        for line in f:
+            if line.isspace():
+                continue
+            yield json.loads(line)
+
+
+def _checks_event_range(global_constraints: list) -> bool:
+    for constraint in global_constraints:
+        rule = (constraint.get("rule") or "").strip().lower()
+        if constraint.get("type") == "Event" and "end" in rule and "start" in rule:
+            return True
+    return False
+
+
 def validate_graph(graph_path: str, schema_path: str) -> list:
-    """Validate graph against schema constraints."""
-    entities, relations = load_graph(graph_path)
+    """Validate graph against schema constraints.
+
+    Streams the log once, keeping only each entity's type, the properties the
+    schema inspects, and the endpoints of schema-constrained relations.
+    """
     errors = []
     
     # Load schema if exists
@@ -259,100 +518,139 @@ def validate_graph(graph_path: str, schema_path: str) -> list:
     relation_schemas = schema.get("relations", {})
     global_constraints = schema.get("constraints", [])
     
-    for entity_id, entity in entities.items():
-        type_name = entity["type"]
-        type_schema = type_schemas.get(type_name, {})
+    compiled_schemas = compile_type_schemas(type_schemas)
+    tracked_props = {
+        type_name: {*required, *forbidden, *(field for field, _, _ in enums)}
+        for type_name, (required, forbidden, enums) in compiled_schemas.items()
+    }
+    if _checks_event_range(global_constraints):
+        tracked_props.setdefault("Event", set()).update(("start", "end"))
+    
+    entity_types = {}
+    entity_props = {}
+    # rel_type -> {sequence: (from, to)}, keyed like replay_ops so an unrelate
+    # removes every parallel edge.
+    rel_edges = {rel_type: {} for rel_type in relation_schemas}
+    seqs_by_key = defaultdict(list)
+    next_seq = 0
+    
+    for record in iter_ops(graph_path):
+        op = record.get("op")
+        
+        if op == "create":
+            entity = record["entity"]
+            entity_types[entity["id"]] = entity["type"]
+            tracked = tracked_props.get(entity["type"], ())
+            entity_props[entity["id"]] = {
+                k: v for k, v in entity.get("properties", {}).items() if k in tracked
+            }
+        elif op == "update":
+            entity_id = record["id"]
+            if entity_id in entity_types:
+                tracked = tracked_props.get(entity_types[entity_id], ())
+                entity_props[entity_id].update(
+                    (k, v) for k, v in record.get("properties", {}).items() if k in tracked
+                )
+        elif op == "delete":
+            entity_types.pop(record["id"], None)
+            entity_props.pop(record["id"], None)
+        elif op == "relate":
+            edges = rel_edges.get(record["rel"])
+            if edges is not None:
+                edges[next_seq] = (record["from"], record["to"])
+                seqs_by_key[(record["from"], record["rel"], record["to"])].append(next_seq)
+                next_seq += 1
+        elif op == "unrelate":
+            edges = rel_edges.get(record["rel"])
+            for seq in seqs_by_key.pop((record["from"], record["rel"], record["to"]), ()):
+                del edges[seq]
+    
+    for entity_id, type_name in entity_types.items():
+        compiled = compiled_schemas.get(type_name)
+        if compiled is None:
+            continue
+        required, forbidden, enums = compiled
+        properties = entity_props[entity_id]
         
         # Check required properties
-        required = type_schema.get("required", [])
         for prop in required:
-            if prop not in entity["properties"]:
+            if prop not in properties:
                 errors.append(f"{entity_id}: missing required property '{prop}'")
         
         # Check forbidden properties
-        forbidden = type_schema.get("forbidden_properties", [])
         for prop in forbidden:
-            if prop in entity["properties"]:
+            if prop in properties:
                 errors.append(f"{entity_id}: contains forbidden property '{prop}'")
         
         # Check enum values
-        for prop, allowed in type_schema.items():
-            if prop.endswith("_enum"):
-                field = prop.replace("_enum", "")
-                value = entity["properties"].get(field)
-                if value and value not in allowed:
-                    errors.append(f"{entity_id}: '{field}' must be one of {allowed}, got '{value}'")
+        for field, allowed, allowed_set in enums:
+            value = properties.get(field)
+            if value and not _enum_allows(value, allowed, allowed_set):
+                errors.append(f"{entity_id}: '{field}' must be one of {allowed}, got '{value}'")
     
     # Relation constraints (type + cardinality + acyclicity)
-    rel_index = {}
-    for rel in relations:
-        rel_index.setdefault(rel["rel"], []).append(rel)
-    
     for rel_type, rel_schema in relation_schemas.items():
-        rels = rel_index.get(rel_type, [])
+        rels = rel_edges[rel_type].values()
         from_types = rel_schema.get("from_types", [])
         to_types = rel_schema.get("to_types", [])
+        from_types_set = set(from_types)
+        to_types_set = set(to_types)
         cardinality = rel_schema.get("cardinality")
         acyclic = rel_schema.get("acyclic", False)
         
         # Type checks
-        for rel in rels:
-            from_entity = entities.get(rel["from"])
-            to_entity = entities.get(rel["to"])
-            if not from_entity or not to_entity:
-                errors.append(f"{rel_type}: relation references missing entity ({rel['from']} -> {rel['to']})")
+        for from_id, to_id in rels:
+            from_type = entity_types.get(from_id)
+            to_type = entity_types.get(to_id)
+            if from_type is None or to_type is None:
+                errors.append(f"{rel_type}: relation references missing entity ({from_id} -> {to_id})")
                 continue
-            if from_types and from_entity["type"] not in from_types:
+            if from_types_set and from_type not in from_types_set:
                 errors.append(
-                    f"{rel_type}: from entity {rel['from']} type {from_entity['type']} not in {from_types}"
+                    f"{rel_type}: from entity {from_id} type {from_type} not in {from_types}"
                 )
-            if to_types and to_entity["type"] not in to_types:
+            if to_types_set and to_type not in to_types_set:
                 errors.append(
-                    f"{rel_type}: to entity {rel['to']} type {to_entity['type']} not in {to_types}"
+                    f"{rel_type}: to entity {to_id} type {to_type} not in {to_types}"
                 )
         
         # Cardinality checks
         if cardinality in ("one_to_one", "one_to_many", "many_to_one"):
-            from_counts = {}
-            to_counts = {}
-            for rel in rels:
-                from_counts[rel["from"]] = from_counts.get(rel["from"], 0) + 1
-                to_counts[rel["to"]] = to_counts.get(rel["to"], 0) + 1
-            
+            # Only count the side(s) the rule constrains.
             if cardinality in ("one_to_one", "many_to_one"):
+                from_counts = Counter(from_id for from_id, _ in rels)
                 for from_id, count in from_counts.items():
                     if count > 1:
                         errors.append(f"{rel_type}: from entity {from_id} violates cardinality {cardinality}")
             if cardinality in ("one_to_one", "one_to_many"):
+                to_counts = Counter(to_id for _, to_id in rels)
                 for to_id, count in to_counts.items():
                     if count > 1:
                         errors.append(f"{rel_type}: to entity {to_id} violates cardinality {cardinality}")
         
         # Acyclic checks
         if acyclic:
-            graph = {}
-            for rel in rels:
-                graph.setdefault(rel["from"], []).append(rel["to"])
-            
-            visited = {}
+            # Kahn's algorithm: repeatedly peel off nodes with no incoming
+            # edges; any node left unprocessed sits on a cycle.
+            adj = {}
+            in_degree = {}
+            for from_id, to_id in rels:
+                adj.setdefault(from_id, []).append(to_id)
+                in_degree.setdefault(from_id, 0)
+                in_degree[to_id] = in_degree.get(to_id, 0) + 1
             
-            def dfs(node, stack):
-                visited[node] = True
-                stack.add(node)
-                for nxt in graph.get(node, []):
-                    if nxt in stack:
-                        return True
-                    if not visited.get(nxt, False):
-                        if dfs(nxt, stack):
-                            return True
-                stack.remove(node)
-                return False
+            queue = deque(node for node, degree in in_degree.items() if degree == 0)
+            processed = 0
+            while queue:
+                node = queue.popleft()
+                processed += 1
+                for nxt in adj.get(node, ()):
+                    in_degree[nxt] -= 1
+                    if in_degree[nxt] == 0:
+                        queue.append(nxt)
             
-            for node in graph:
-                if not visited.get(node, False):
-                    if dfs(node, set()):
-                        errors.append(f"{rel_type}: cyclic dependency detected")
-                        break
+            if processed < len(in_degree):
+                errors.append(f"{rel_type}: cyclic dependency detected")
     
     # Global constraints (limited enforcement)
     for constraint in global_constraints:
@@ -360,11 +658,11 @@ def validate_graph(graph_path: str, schema_path: str) -> list:
         relation = constraint.get("relation")
         rule = (constraint.get("rule") or "").strip().lower()
         if ctype == "Event" and "end" in rule and "start" in rule:
-            for entity_id, entity in entities.items():
-                if entity["type"] != "Event":
+            for entity_id, type_name in entity_types.items():
+                if type_name != "Event":
                     continue
-                start = entity["properties"].get("start")
-                end = entity["properties"].get("end")
+                start = entity_props[entity_id].get("start")
+                end = entity_props[entity_id].get("end")
                 if start and end:
                     try:
                         start_dt = datetime.fromisoformat(start)
@@ -380,23 +678,35 @@ def validate_graph(graph_path: str, schema_path: str) -> list:
     return errors
 
 
+def read_schema_file(schema_file: Path) -> dict:
+    """Read a JSON or YAML schema file; PyYAML is only imported for YAML."""
+    text = schema_file.read_text()
+    if not text.strip():
+        # An empty schema file means no schema, as with yaml.safe_load.
+        return {}
+    if schema_file.suffix.lower() == ".json":
+        return json.loads(text) or {}
+    import yaml
+    return yaml.safe_load(text) or {}
+
+
 def load_schema(schema_path: str) -> dict:
-    """Load schema from YAML if it exists."""
-    schema = {}
+    """Load schema from YAML (or JSON) if it exists."""
     schema_file = Path(schema_path)
     if schema_file.exists():
-        import yaml
-        with open(schema_file) as f:
-            schema = yaml.safe_load(f) or {}
-    return schema
+        return read_schema_file(schema_file)
+    return {}
 
 
 def write_schema(schema_path: str, schema: dict) -> None:
-    """Write schema to YAML."""
+    """Write schema to YAML (or JSON for a .json path)."""
     schema_file = Path(schema_path)
     schema_file.parent.mkdir(parents=True, exist_ok=True)
-    import yaml
     with open(schema_file, "w") as f:
+        if schema_file.suffix.lower() == ".json":
+            json.dump(schema, f, indent=2)
+            return
+        import yaml
         yaml.safe_dump(schema, f, sort_keys=False)
 
 
@@ -420,46 +730,55 @@ def append_schema(schema_path: str, incoming: dict) -> dict:
     return merged
 
 
+def dump_json(obj, pretty: bool = False) -> str:
+    """Serialize CLI output; compact unless `pretty` is set."""
+    if pretty:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ontology graph operations")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pretty", action="store_true", help="Indent JSON output")
     subparsers = parser.add_subparsers(dest="command", required=True)
     
     # Create
-    create_p = subparsers.add_parser("create", help="Create entity")
+    create_p = subparsers.add_parser("create", help="Create entity", parents=[common])
     create_p.add_argument("--type", "-t", required=True, help="Entity type")
     create_p.add_argument("--props", "-p", default="{}", help="Properties JSON")
     create_p.add_argument("--id", help="Entity ID (auto-generated if not provided)")
     create_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Get
-    get_p = subparsers.add_parser("get", help="Get entity by ID")
+    get_p = subparsers.add_parser("get", help="Get entity by ID", parents=[common])
     get_p.add_argument("--id", required=True, help="Entity ID")
     get_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Query
-    query_p = subparsers.add_parser("query", help="Query entities")
+    query_p = subparsers.add_parser("query", help="Query entities", parents=[common])
     query_p.add_argument("--type", "-t", help="Entity type")
     query_p.add_argument("--where", "-w", default="{}", help="Filter JSON")
     query_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # List
-    list_p = subparsers.add_parser("list", help="List entities")
+    list_p = subparsers.add_parser("list", help="List entities", parents=[common])
     list_p.add_argument("--type", "-t", help="Entity type")
     list_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Update
-    update_p = subparsers.add_parser("update", help="Update entity")
+    update_p = subparsers.add_parser("update", help="Update entity", parents=[common])
     update_p.add_argument("--id", required=True, help="Entity ID")
     update_p.add_argument("--props", "-p", required=True, help="Properties JSON")
     update_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Delete
-    delete_p = subparsers.add_parser("delete", help="Delete entity")
+    delete_p = subparsers.add_parser("delete", help="Delete entity", parents=[common])
     delete_p.add_argument("--id", required=True, help="Entity ID")
     delete_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Relate
-    relate_p = subparsers.add_parser("relate", help="Create relation")
+    relate_p = subparsers.add_parser("relate", help="Create relation", parents=[common])
     relate_p.add_argument("--from", dest="from_id", required=True, help="From entity ID")
     relate_p.add_argument("--rel", "-r", required=True, help="Relation type")
     relate_p.add_argument("--to", dest="to_id", required=True, help="To entity ID")
@@ -467,25 +786,29 @@ def main():
     relate_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Related
-    related_p = subparsers.add_parser("related", help="Get related entities")
+    related_p = subparsers.add_parser("related", help="Get related entities", parents=[common])
     related_p.add_argument("--id", required=True, help="Entity ID")
     related_p.add_argument("--rel", "-r", help="Relation type filter")
     related_p.add_argument("--dir", "-d", choices=["outgoing", "incoming", "both"], default="outgoing")
     related_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     
     # Validate
-    validate_p = subparsers.add_parser("validate", help="Validate graph")
+    validate_p = subparsers.add_parser("validate", help="Validate graph", parents=[common])
     validate_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
     validate_p.add_argument("--schema", "-s", default=DEFAULT_SCHEMA_PATH)
 
+    # Compact
+    compact_p = subparsers.add_parser("compact", help="Compact graph log and refresh snapshot", parents=[common])
+    compact_p.add_argument("--graph", "-g", default=DEFAULT_GRAPH_PATH)
+
     # Schema append
-    schema_p = subparsers.add_parser("schema-append", help="Append/merge schema fragment")
+    schema_p = subparsers.add_parser("schema-append", help="Append/merge schema fragment", parents=[common])
     schema_p.add_argument("--schema", "-s", default=DEFAULT_SCHEMA_PATH)
     schema_p.add_argument("--data", "-d", help="Schema fragment as JSON")
     schema_p.add_argument("--file", "-f", help="Schema fragment file (YAML or JSON)")
     
     args = parser.parse_args()
-    workspace_root = Path.cwd().resolve()
+    workspace_root = os.path.realpath(os.getcwd())
 
     if hasattr(args, "graph"):
         args.graph = str(
@@ -505,29 +828,29 @@ def main():
     if args.command == "create":
         props = json.loads(args.props)
         entity = create_entity(args.type, props, args.graph, args.id)
-        print(json.dumps(entity, indent=2))
+        print(dump_json(entity, args.pretty))
     
     elif args.command == "get":
         entity = get_entity(args.id, args.graph)
         if entity:
-            print(json.dumps(entity, indent=2))
+            print(dump_json(entity, args.pretty))
         else:
             print(f"Entity not found: {args.id}")
     
     elif args.command == "query":
         where = json.loads(args.where)
         results = query_entities(args.type, where, args.graph)
-        print(json.dumps(results, indent=2))
+        print(dump_json(results, args.pretty))
     
     elif args.command == "list":
         results = list_entities(args.type, args.graph)
-        print(json.dumps(results, indent=2))
+        print(dump_json(results, args.pretty))
     
     elif args.command == "update":
         props = json.loads(args.props)
         entity = update_entity(args.id, props, args.graph)
         if entity:
-            print(json.dumps(entity, indent=2))
+            print(dump_json(entity, args.pretty))
         else:
             print(f"Entity not found: {args.id}")
     
@@ -540,11 +863,11 @@ def main():
     elif args.command == "relate":
         props = json.loads(args.props)
         rel = create_relation(args.from_id, args.rel, args.to_id, props, args.graph)
-        print(json.dumps(rel, indent=2))
+        print(dump_json(rel, args.pretty))
     
     elif args.command == "related":
         results = get_related(args.id, args.rel, args.graph, args.dir)
-        print(json.dumps(results, indent=2))
+        print(dump_json(results, args.pretty))
     
     elif args.command == "validate":
         errors = validate_graph(args.graph, args.schema)
@@ -555,6 +878,10 @@ def main():
         else:
             print("Graph is valid.")
     
+    elif args.command == "compact":
+        stats = compact_graph(args.graph)
+        print(dump_json(stats, args.pretty))
+    
     elif args.command == "schema-append":
         if not args.data and not args.file:
             raise SystemExit("schema-append requires --data or --file")
@@ -563,17 +890,10 @@ def main():
         if args.data:
             incoming = json.loads(args.data)
         else:
-            path = Path(args.file)
-            if path.suffix.lower() == ".json":
-                with open(path) as f:
-                    incoming = json.load(f)
-            else:
-                import yaml
-                with open(path) as f:
-                    incoming = yaml.safe_load(f) or {}
+            incoming = read_schema_file(Path(args.file))
         
         merged = append_schema(args.schema, incoming)
-        print(json.dumps(merged, indent=2))
+        print(dump_json(merged, args.pretty))
 
 
 if __name__ == "__main__":
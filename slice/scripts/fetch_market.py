@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
+import gzip
 import json
+import os
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 from pathlib import Path
 
 BASE = "https://query1.finance.yahoo.com"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36",
+    "Accept-Encoding": "gzip",
+}
 
 TRACKED_MCAP = ["NVDA", "AAPL", "GOOG", "MSFT", "AMZN", "META", "AVGO", "TSLA", "BRK-B", "WMT"]
 CORE = ["^IXIC", "BTC-USD", "ETH-USD", "SOL-USD", "GC=F"]
@@ -17,14 +24,12 @@ WEB_FILE = ROOT / "web" / "latest.json"
 
 
 def fetch_json(url: str):
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36"
-        },
-    )
+    req = urllib.request.Request(url, headers=HEADERS)
     with urllib.request.urlopen(req, timeout=20) as r:
-        return json.loads(r.read().decode("utf-8"))
+        body = r.read()
+        if r.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+    return json.loads(body)
 
 
 def quote(symbols):
@@ -56,6 +61,13 @@ def screener(scr_id: str, count: int = 5):
     return out
 
 
+def safe_screener(scr_id: str, count: int = 5):
+    try:
+        return screener(scr_id, count)
+    except Exception:
+        return []
+
+
 def compact_quote_map(quotes):
     out = {}
     for x in quotes:
@@ -78,9 +90,24 @@ def fmt_num(v):
     return round(float(v), 2)
 
 
+def write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_outputs(data: bytes):
+    # Separate files, not a shared inode: WEB_FILE is also rewritten in place by
+    # tools/slice_market_json.py, which must not clobber DATA_FILE.
+    write_atomic(DATA_FILE, data)
+    write_atomic(WEB_FILE, data)
+
+
 def run():
-    core = compact_quote_map(quote(CORE))
-    mcap_quotes = compact_quote_map(quote(TRACKED_MCAP))
+    # One quote round-trip covers both symbol groups; split the map afterwards.
+    quotes = compact_quote_map(quote(CORE + TRACKED_MCAP))
+    core = {s: quotes[s] for s in CORE if s in quotes}
+    mcap_quotes = {s: quotes[s] for s in TRACKED_MCAP if s in quotes}
 
     top_mcap = sorted(
         [mcap_quotes[s] for s in mcap_quotes],
@@ -89,14 +116,8 @@ def run():
     )[:10]
 
     # Yahoo screeners can fail occasionally; keep resilient.
-    try:
-        gainers = screener("day_gainers", 5)
-    except Exception:
-        gainers = []
-    try:
-        losers = screener("day_losers", 5)
-    except Exception:
-        losers = []
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        gainers, losers = pool.map(safe_screener, ["day_gainers", "day_losers"])
 
     now_utc = datetime.now(timezone.utc)
     now_et = now_utc.astimezone(ZoneInfo("America/New_York"))
@@ -161,9 +182,7 @@ def run():
     DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
     WEB_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    txt = json.dumps(payload, indent=2)
-    DATA_FILE.write_text(txt + "\n", encoding="utf-8")
-    WEB_FILE.write_text(txt + "\n", encoding="utf-8")
+    write_outputs(json.dumps(payload, indent=2).encode() + b"\n")
 
 
 if __name__ == "__main__":
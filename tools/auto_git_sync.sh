@@ -9,6 +9,7 @@ EXCLUDES=(
   "slice/web/latest.json"
   "slice/web/news.json"
   "memory/blossom-slot-state.json"
+  "memory/ontology/graph.jsonl.snapshot"
 )
 
 # Stage everything first, then unstage excluded paths.
@@ -1,12 +1,40 @@
 #!/usr/bin/env python3
 import json
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, date
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 UA = {"User-Agent": "Mozilla/5.0 (OpenClaw market report)"}
 
+CACHE_DIR = Path.home() / ".cache" / "openclaw"
+# The holiday calendar changes rarely; re-scrape it at most monthly.
+CLOSED_DATES_TTL = 30 * 86400
+
+# main() calls the Yahoo screener twice in a row; the second call reuses the connection.
+SESSION = requests.Session()
+SESSION.headers.update(UA)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
+
+_RE_CAL_ROW = re.compile(r"<tr[^>]*>(.*?)</tr>", re.S | re.I)
+_RE_TAG = re.compile(r"<[^<]+?>")
+_RE_CLOSED = re.compile(r"([A-Za-z]+\s+\d{1,2},\s+\d{4})\s+.*\sClosed\b")
+_RE_STOOQ_VOL = re.compile(rb'"volume":\s*}')
+_RE_ROW = re.compile(r"<tr>(.*?)</tr>", re.S)
+_RE_RANK = re.compile(r'class="rank-td[^"\']*"[^>]*data-sort="(\d+)"')
+_RE_NAME = re.compile(r'class="company-name">\s*([^<]+)\s*</div>')
+# Market cap cell: <td class="td-right" data-sort="4450..."> $4.450 T
+_RE_CAP_CELL = re.compile(r'<td class="td-right" data-sort="\d+"[^>]*>\s*(?:<span[^>]*>\$</span>)?\s*([^<]+)\s*</td>')
+
 
 def ny_date_today():
     # Avoid dependencies: approximate NY by fixed offset rules is messy.
@@ -18,16 +46,16 @@ def ny_date_today():
 def get_nasdaq_trader_closed_dates(year: int):
     """Scrape NasdaqTrader Trading Calendar and return a set of date objects when US markets are CLOSED."""
     url = "https://www.nasdaqtrader.com/Trader.aspx?id=Calendar"
-    html = requests.get(url, headers=UA, timeout=25).text
-    rows = re.findall(r"<tr[^>]*>(.*?)</tr>", html, flags=re.S | re.I)
+    html = SESSION.get(url, timeout=25).text
     closed = set()
-    for row in rows:
+    for row_m in _RE_CAL_ROW.finditer(html):
+        row = row_m.group(1)
         if "closed" not in row.lower():
             continue
-        txt = re.sub(r"<[^<]+?>", " ", row)
+        txt = _RE_TAG.sub(" ", row)
         txt = " ".join(txt.split())
         # Example: "January 1, 2026 New Years Day (Observed) Closed"
-        m = re.match(r"([A-Za-z]+\s+\d{1,2},\s+\d{4})\s+.*\sClosed\b", txt)
+        m = _RE_CLOSED.match(txt)
         if not m:
             continue
         ds = m.group(1)
@@ -40,10 +68,33 @@ def get_nasdaq_trader_closed_dates(year: int):
     return closed
 
 
+def closed_dates_cached(year: int):
+    """get_nasdaq_trader_closed_dates backed by a per-year JSON cache with a CLOSED_DATES_TTL lifetime."""
+    path = CACHE_DIR / f"closed_dates_{year}.json"
+    try:
+        cached = json.loads(path.read_bytes())
+        if time.time() - cached["fetched_at"] < CLOSED_DATES_TTL:
+            return {date.fromisoformat(d) for d in cached["dates"]}
+    except Exception:
+        pass
+
+    closed = get_nasdaq_trader_closed_dates(year)
+    if closed:
+        # An empty set most likely means the page layout changed; don't pin it for a month.
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_bytes(json.dumps({"fetched_at": time.time(), "dates": sorted(d.isoformat() for d in closed)}).encode())
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return closed
+
+
 def is_market_closed_today():
     today = ny_date_today()
     try:
-        closed = get_nasdaq_trader_closed_dates(today.year)
+        closed = closed_dates_cached(today.year)
         return today in closed
     except Exception:
         # If the calendar scrape fails, don't block reports.
@@ -51,9 +102,9 @@ def is_market_closed_today():
 
 
 def get_json(url, timeout=20):
-    r = requests.get(url, headers=UA, timeout=timeout)
+    r = SESSION.get(url, timeout=timeout)
     r.raise_for_status()
-    return r.json()
+    return json.loads(r.content)
 
 
 def pct_fmt(v):
@@ -85,9 +136,12 @@ def num_fmt(v):
 def get_stooq_symbol(symbol):
     url = f"https://stooq.com/q/l/?s={symbol}&f=sd2t2ohlcv&h&e=json"
     # Stooq sometimes returns invalid JSON (e.g., volume:}) — sanitize lightly.
-    txt = requests.get(url, headers=UA, timeout=20).text
-    txt = re.sub(r'"volume":\s*}', '"volume":null}', txt)
-    data = json.loads(txt)
+    raw = SESSION.get(url, timeout=20).content.replace(b'"volume":}', b'"volume":null}')
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        # Rarer variant with whitespace before the brace.
+        data = json.loads(_RE_STOOQ_VOL.sub(b'"volume":null}', raw))
     arr = data.get("symbols", [])
     if not arr:
         return None
@@ -133,32 +187,35 @@ def get_yahoo_screener(scr_id, count):
 
 def get_top10_marketcap_from_companiesmarketcap():
     url = "https://companiesmarketcap.com/usa/largest-companies-in-the-usa-by-market-cap/"
-    html = requests.get(url, headers=UA, timeout=25).text
+    html = SESSION.get(url, timeout=25).text
 
-    # Parse each row quickly with regex (site is fairly stable)
-    rows = re.findall(r"<tr>(.*?)</tr>", html, flags=re.S)
+    # Parse each row quickly with regex (site is fairly stable). Rows are
+    # scanned lazily and the scan stops once ranks 1-10 have all been seen.
     out = []
-    for row in rows:
+    seen_ranks = set()
+    for row_m in _RE_ROW.finditer(html):
+        if len(seen_ranks) >= 10:
+            break
+        row = row_m.group(1)
         # skip header rows
         if "rank-td" not in row or "company-name" not in row:
             continue
 
-        rank_m = re.search(r'class="rank-td[^"\']*"[^>]*data-sort="(\d+)"', row)
+        rank_m = _RE_RANK.search(row)
         if not rank_m:
             continue
         rank = int(rank_m.group(1))
         if rank > 10:
             continue
 
-        name_m = re.search(r'class="company-name">\s*([^<]+)\s*</div>', row)
-        cap_m = re.search(r'th-mcap|Market Cap', row)
-        # Market cap cell: <td class="td-right" data-sort="4450..."> $4.450 T
-        cap_cell_m = re.search(r'<td class="td-right" data-sort="\d+"[^>]*>\s*(?:<span[^>]*>\$</span>)?\s*([^<]+)\s*</td>', row)
+        name_m = _RE_NAME.search(row)
+        cap_cell_m = _RE_CAP_CELL.search(row)
 
         name = name_m.group(1).strip() if name_m else "Unknown"
         market_cap = cap_cell_m.group(1).strip() if cap_cell_m else "n/a"
 
         out.append({"rank": rank, "name": name, "market_cap": market_cap})
+        seen_ranks.add(rank)
 
     out.sort(key=lambda x: x["rank"])
     return out[:10]
@@ -200,8 +257,8 @@ def main():
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
-    ndq = get_stooq_symbol("^ndq")
-    gold = get_stooq_symbol("xauusd")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        ndq, gold = pool.map(get_stooq_symbol, ["^ndq", "xauusd"])
 
     gainers = get_yahoo_screener("day_gainers", 5)
     losers = get_yahoo_screener("day_losers", 5)
@@ -3,13 +3,21 @@ import csv
 import io
 import json
 import re
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from operator import itemgetter
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 UA = {"User-Agent": "Mozilla/5.0 (Slice market updater)"}
 OUT = "/home/manu/.openclaw/workspace/slice/web/latest.json"
+_ET = ZoneInfo("America/New_York")
 
 TOP = [
     ("NVDA", "NVIDIA", "nvda.us"),
@@ -58,10 +66,24 @@ ETF_SPECS = [
 ]
 
 STABLE_SYMBOLS = {"USDT", "USDC", "DAI", "TUSD", "FDUSD", "USDE", "USDP", "PYUSD"}
+_SYM_RE = re.compile(r"^[A-Z]{2,6}$")
+
+CHART_WORKERS = 16
+# Daily bars back to just past the 5y base date (the oldest lookback perf_metrics
+# uses), with slack so closes_on_or_before still finds a bar across weekends/holidays.
+CHART_LOOKBACK = (5 * 366 + 14) * 86400
+
+# Shared across worker threads so every fetch reuses pooled TCP/TLS connections.
+SESSION = requests.Session()
+SESSION.headers.update(UA)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
 
 
 def get_text(url, timeout=10):
-    return requests.get(url, headers=UA, timeout=timeout).text
+    return SESSION.get(url, timeout=timeout).text
 
 
 def pct_from_base(cur, base):
@@ -70,18 +92,22 @@ def pct_from_base(cur, base):
     return ((cur - base) / base) * 100
 
 
-def closest_on_or_before(rows, target_date):
-    pick = None
-    for r in rows:
-        if r["date"] <= target_date:
-            pick = r
-        else:
-            break
-    return pick
+def closes_on_or_before(dates, closes, targets):
+    """Close of the last bar dated on or before each of the ascending `targets`; `dates` must be ascending.
 
+    Each search starts where the previous one stopped, so the lookups share one sweep of `dates`.
+    """
+    out = []
+    lo = 0
+    for target in targets:
+        lo = bisect_right(dates, target, lo)
+        out.append(closes[lo - 1] if lo else None)
+    return out
 
-def perf_metrics(rows, current_price):
-    if not rows:
+
+def perf_metrics(dates, closes, highs, lows, current_price):
+    """Compute performance figures from date-sorted parallel bar columns."""
+    if not dates:
         return {
             "todayPct": None,
             "currentClose": None,
@@ -94,83 +120,104 @@ def perf_metrics(rows, current_price):
             "week52PosPct": None,
         }
 
-    rows = sorted(rows, key=lambda x: x["date"])
     if current_price is None:
-        current_price = rows[-1].get("close")
+        current_price = closes[-1]
 
-    now_et = datetime.now(ZoneInfo("America/New_York")).date()
+    now_et = datetime.now(_ET).date()
     y_start = datetime(now_et.year, 1, 1).date()
     d1 = datetime(now_et.year - 1, now_et.month, now_et.day).date()
     d3 = datetime(now_et.year - 3, now_et.month, now_et.day).date()
     d5 = datetime(now_et.year - 5, now_et.month, now_et.day).date()
 
-    y_base = closest_on_or_before(rows, y_start)
-    p1 = closest_on_or_before(rows, d1)
-    p3 = closest_on_or_before(rows, d3)
-    p5 = closest_on_or_before(rows, d5)
+    # d5 < d3 < d1 <= y_start, so the four bases come from one ascending sweep.
+    p5, p3, p1, y_base = closes_on_or_before(dates, closes, (d5, d3, d1, y_start))
 
-    w52 = [r for r in rows if r["date"] >= d1]
-    w52_low = min((r["low"] for r in w52), default=None)
-    w52_high = max((r["high"] for r in w52), default=None)
+    w52_start = bisect_left(dates, d1)
+    w52_low = min(lows[w52_start:], default=None)
+    w52_high = max(highs[w52_start:], default=None)
     w52_pos = None
     if current_price is not None and w52_low is not None and w52_high is not None and w52_high > w52_low:
         w52_pos = ((current_price - w52_low) / (w52_high - w52_low)) * 100
 
-    prev_close = rows[-2]["close"] if len(rows) >= 2 else None
+    prev_close = closes[-2] if len(closes) >= 2 else None
     today_pct = pct_from_base(current_price, prev_close)
 
     return {
         "todayPct": today_pct,
         "currentClose": current_price,
-        "ytdPct": pct_from_base(current_price, y_base["close"] if y_base else None),
-        "oneYearPct": pct_from_base(current_price, p1["close"] if p1 else None),
-        "threeYearPct": pct_from_base(current_price, p3["close"] if p3 else None),
-        "fiveYearPct": pct_from_base(current_price, p5["close"] if p5 else None),
+        "ytdPct": pct_from_base(current_price, y_base),
+        "oneYearPct": pct_from_base(current_price, p1),
+        "threeYearPct": pct_from_base(current_price, p3),
+        "fiveYearPct": pct_from_base(current_price, p5),
         "week52Low": w52_low,
         "week52High": w52_high,
         "week52PosPct": w52_pos,
     }
 
 
+def fetch_chart(symbol):
+    """Download the daily series for `symbol` as parallel timestamp/close/high/low lists."""
+    now = int(time.time())
+    r = SESSION.get(
+        f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}",
+        params={"interval": "1d", "period1": now - CHART_LOOKBACK, "period2": now, "events": "history"},
+        timeout=8,
+    )
+    # Parse the raw body bytes (skipping requests' text decode) and keep only
+    # the four arrays we use; the rest of the document is dropped on return.
+    d = json.loads(r.content)
+    res = (d.get("chart", {}).get("result") or [None])[0]
+    if not res:
+        return None
+    q = res.get("indicators", {}).get("quote", [{}])[0]
+    return {
+        "timestamp": res.get("timestamp") or [],
+        "close": q.get("close") or [],
+        "high": q.get("high") or [],
+        "low": q.get("low") or [],
+    }
+
+
 def yahoo_chart_metrics(symbol):
     try:
-        r = requests.get(
-            f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}",
-            params={"interval": "1d", "range": "10y", "events": "history"},
-            headers=UA,
-            timeout=8,
-        )
-        d = r.json()
-        res = (d.get("chart", {}).get("result") or [None])[0]
-        if not res:
+        series = fetch_chart(symbol)
+        if not series:
             return {}
-        ts = res.get("timestamp") or []
-        q = res.get("indicators", {}).get("quote", [{}])[0]
-        closes = q.get("close") or []
-        highs = q.get("high") or []
-        lows = q.get("low") or []
+        ts = series["timestamp"]
+        closes = series["close"]
+        highs = series["high"]
+        lows = series["low"]
         rows = []
         for i, t in enumerate(ts):
             try:
                 c, h, l = closes[i], highs[i], lows[i]
                 if c is None or h is None or l is None:
                     continue
-                rows.append({
-                    "date": datetime.fromtimestamp(t, tz=ZoneInfo("America/New_York")).date(),
-                    "close": float(c),
-                    "high": float(h),
-                    "low": float(l),
-                })
+                rows.append((
+                    datetime.fromtimestamp(t, tz=_ET).date(),
+                    float(c),
+                    float(h),
+                    float(l),
+                ))
             except Exception:
                 continue
         if not rows:
             return {}
-        rows.sort(key=lambda x: x["date"])
-        return perf_metrics(rows, rows[-1]["close"])
+        rows.sort(key=itemgetter(0))
+        # Transpose into columns so perf_metrics can bisect dates and slice windows.
+        dates, closes, highs, lows = (list(col) for col in zip(*rows))
+        return perf_metrics(dates, closes, highs, lows, closes[-1])
     except Exception:
         return {}
 
 
+def chart_metrics_many(symbols):
+    """Run yahoo_chart_metrics concurrently, once per distinct symbol; returns {symbol: perf}."""
+    unique = list(dict.fromkeys(symbols))
+    with ThreadPoolExecutor(max_workers=CHART_WORKERS) as pool:
+        return dict(zip(unique, pool.map(yahoo_chart_metrics, unique)))
+
+
 def normalized_row(name, symbol, current_price, perf, extra=None):
     extra = extra or {}
     return {
@@ -192,7 +239,7 @@ def normalized_row(name, symbol, current_price, perf, extra=None):
 def crypto_top10():
     preferred = ["BTC", "ETH", "SOL", "XRP", "BNB", "ADA", "DOGE", "TRX", "DOT", "LINK", "AVAX", "TON", "LTC"]
     try:
-        data = requests.get(
+        r = SESSION.get(
             "https://api.coingecko.com/api/v3/coins/markets",
             params={
                 "vs_currency": "usd",
@@ -202,9 +249,9 @@ def crypto_top10():
                 "sparkline": "false",
                 "price_change_percentage": "24h",
             },
-            headers=UA,
             timeout=8,
-        ).json()
+        )
+        data = json.loads(r.content)
         if not isinstance(data, list):
             data = []
     except Exception:
@@ -215,9 +262,7 @@ def crypto_top10():
         if not isinstance(x, dict):
             continue
         sym = (x.get("symbol") or "").upper()
-        if not re.match(r"^[A-Z]{2,6}$", sym):
-            continue
-        if sym in STABLE_SYMBOLS:
+        if sym in STABLE_SYMBOLS or not _SYM_RE.match(sym):
             continue
         cleaned.append(
             {
@@ -230,15 +275,10 @@ def crypto_top10():
             }
         )
 
+    # Preferred coins first (in preferred order), then fill in CoinGecko's market-cap order.
     by_sym = {x["symbol"]: x for x in cleaned}
-    out = []
-    used = set()
-    for sym in preferred:
-        if sym in by_sym and sym not in used:
-            out.append(by_sym[sym])
-            used.add(sym)
-        if len(out) >= 10:
-            break
+    out = [by_sym[sym] for sym in preferred if sym in by_sym][:10]
+    used = {x["symbol"] for x in out}
     if len(out) < 10:
         for x in cleaned:
             if x["symbol"] in used:
@@ -253,8 +293,9 @@ def crypto_top10():
         out = [{"symbol": s, "name": s, "price": None, "changePct": None, "marketCap": None} for s in preferred[:10]]
 
     rows = []
+    perfs = chart_metrics_many([f"{x.get('symbol')}-USD" for x in out])
     for i, x in enumerate(out, start=1):
-        perf = yahoo_chart_metrics(f"{x.get('symbol')}-USD")
+        perf = perfs[f"{x.get('symbol')}-USD"]
         if not perf:
             perf = {
                 "todayPct": x.get("changePct"),
@@ -291,28 +332,35 @@ def crypto_top10():
 
 def main():
     now_utc = datetime.now(timezone.utc)
-    now_et = now_utc.astimezone(ZoneInfo("America/New_York"))
+    now_et = now_utc.astimezone(_ET)
 
     prev = {}
     try:
-        with open(OUT, "r", encoding="utf-8") as f:
-            prev = json.load(f)
+        prev = json.loads(Path(OUT).read_bytes())
     except Exception:
         prev = {}
 
+    # Fetch every distinct chart in one concurrent batch, then fan results out by symbol.
+    symbols = (
+        [yahoo_sym for _label, _stooq_sym, yahoo_sym, _region in INDEX_SPECS]
+        + [symbol for symbol, _name, _theme, _stooq_sym in ETF_SPECS]
+        + [symbol for symbol, _name, _stq in TOP]
+    )
+    perfs = chart_metrics_many(symbols)
+
     indexes = []
     for label, _stooq_sym, yahoo_sym, region in INDEX_SPECS:
-        perf = yahoo_chart_metrics(yahoo_sym)
+        perf = perfs[yahoo_sym]
         indexes.append(normalized_row(label, yahoo_sym, perf.get("currentClose"), perf, {"region": region}))
 
     etfs = []
     for symbol, name, theme, _stooq_sym in ETF_SPECS:
-        perf = yahoo_chart_metrics(symbol)
+        perf = perfs[symbol]
         etfs.append(normalized_row(name, symbol, perf.get("currentClose"), perf, {"theme": theme}))
 
     companies = []
     for symbol, name, _stq in TOP:
-        perf = yahoo_chart_metrics(symbol)
+        perf = perfs[symbol]
         companies.append(normalized_row(name, symbol, perf.get("currentClose"), perf, {"marketCap": None}))
 
     crypto = crypto_top10()
@@ -330,8 +378,9 @@ def main():
         "topUsMcapTracked": companies[:20],
     }
 
-    with open(OUT, "w", encoding="utf-8") as f:
-        json.dump(payload, f, separators=(",", ":"))
+    # One-shot dumps runs the C encoder over the whole payload; json.dump
+    # would stream many small chunks through Python-level writes.
+    Path(OUT).write_bytes(json.dumps(payload, separators=(",", ":")).encode())
 
 
 if __name__ == "__main__":
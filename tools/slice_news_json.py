@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import re
 import xml.etree.ElementTree as ET
@@ -7,10 +8,27 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 UA = {"User-Agent": "Mozilla/5.0 (Slice news updater)"}
 ROOT = Path("/home/manu/.openclaw/workspace/slice")
 OUT = ROOT / "web" / "news.json"
+# Upper bound on feeds being fetched/parsed at once.
+FEED_CONCURRENCY = 16
+
+# One pool for all feed threads, sized above FEED_CONCURRENCY so no fetch waits for a slot.
+SESSION = requests.Session()
+SESSION.headers.update(UA)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
+
+_RE_IMG = re.compile(r'<img[^>]+src=["\']([^"\']+)', re.I)
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MRSS_THUMBNAIL = "{http://search.yahoo.com/mrss/}thumbnail"
 
 CATEGORIES = [
     {
@@ -80,19 +98,34 @@ def text(x):
     return (x or "").strip()
 
 
-def parse_feed(url: str):
-    items = []
+def fetch_feed(url: str):
     try:
-        r = requests.get(url, headers=UA, timeout=20)
+        r = SESSION.get(url, timeout=20)
         r.raise_for_status()
-        root = ET.fromstring(r.content)
+        return r.content
+    except Exception:
+        return None
+
+
+async def fetch_and_parse(url, sem):
+    """Fetch and parse one feed in a worker thread, so parsing overlaps other feeds' network I/O."""
+    async with sem:
+        return await asyncio.to_thread(lambda: parse_feed(fetch_feed(url)))
+
+
+def parse_feed(content):
+    items = []
+    if content is None:
+        return items
+    try:
+        root = ET.fromstring(content)
     except Exception:
         return items
 
     channel_title = text(root.findtext("./channel/title"))
 
     # RSS
-    for it in root.findall("./channel/item"):
+    for it in root.iterfind("./channel/item"):
         title = text(it.findtext("title"))
         link = text(it.findtext("link"))
         pub = text(it.findtext("pubDate"))
@@ -105,11 +138,11 @@ def parse_feed(url: str):
         if enc is not None and str(enc.attrib.get("type", "")).startswith("image"):
             img = enc.attrib.get("url")
         if not img:
-            mt = it.find("{http://search.yahoo.com/mrss/}thumbnail")
+            mt = it.find(MRSS_THUMBNAIL)
             if mt is not None:
                 img = mt.attrib.get("url")
         if not img:
-            m = re.search(r'<img[^>]+src=["\']([^"\']+)', desc or "", re.I)
+            m = _RE_IMG.search(desc or "")
             if m:
                 img = m.group(1)
 
@@ -117,15 +150,14 @@ def parse_feed(url: str):
             items.append({"title": title, "url": link, "source": source, "published": pub, "image": img})
 
     # Atom
-    atom_entries = root.findall("{http://www.w3.org/2005/Atom}entry")
-    atom_title = text(root.findtext("{http://www.w3.org/2005/Atom}title"))
-    for e in atom_entries:
-        title = text(e.findtext("{http://www.w3.org/2005/Atom}title"))
+    atom_title = text(root.findtext(ATOM + "title"))
+    for e in root.iterfind(ATOM + "entry"):
+        title = text(e.findtext(ATOM + "title"))
         link = ""
-        link_el = e.find("{http://www.w3.org/2005/Atom}link")
+        link_el = e.find(ATOM + "link")
         if link_el is not None:
             link = text(link_el.attrib.get("href"))
-        pub = text(e.findtext("{http://www.w3.org/2005/Atom}updated")) or text(e.findtext("{http://www.w3.org/2005/Atom}published"))
+        pub = text(e.findtext(ATOM + "updated")) or text(e.findtext(ATOM + "published"))
         source = atom_title
         if title and link:
             items.append({"title": title, "url": link, "source": source, "published": pub, "image": None})
@@ -133,11 +165,13 @@ def parse_feed(url: str):
     return items
 
 
-def curate_category(cat):
+async def curate_category(cat, feeds):
+    """`feeds` maps each feed URL to a task yielding its parsed items (shared across categories)."""
+    parsed = await asyncio.gather(*(feeds[feed] for feed in cat["feeds"]))
     seen = set()
     out = []
-    for feed in cat["feeds"]:
-        for it in parse_feed(feed):
+    for items in parsed:
+        for it in items:
             key = (it.get("url") or "").strip()
             if not key or key in seen:
                 continue
@@ -150,11 +184,18 @@ def curate_category(cat):
     return out[:5]
 
 
-def main():
+async def amain():
     now_utc = datetime.now(timezone.utc)
     now_et = now_utc.astimezone(ZoneInfo("America/New_York"))
 
-    categories = [{"key": cat["key"], "title": cat["title"], "items": curate_category(cat)} for cat in CATEGORIES]
+    # One task per distinct feed; all categories are curated concurrently on top of them.
+    sem = asyncio.Semaphore(FEED_CONCURRENCY)
+    urls = dict.fromkeys(feed for cat in CATEGORIES for feed in cat["feeds"])
+    feeds = {url: asyncio.ensure_future(fetch_and_parse(url, sem)) for url in urls}
+    curated = await asyncio.gather(*(curate_category(cat, feeds) for cat in CATEGORIES))
+    categories = [
+        {"key": cat["key"], "title": cat["title"], "items": items} for cat, items in zip(CATEGORIES, curated)
+    ]
 
     payload = {
         "generatedAtUtc": now_utc.isoformat().replace("+00:00", "Z"),
@@ -163,7 +204,11 @@ def main():
     }
 
     OUT.parent.mkdir(parents=True, exist_ok=True)
-    OUT.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    OUT.write_bytes(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def main():
+    asyncio.run(amain())
 
 
 if __name__ == "__main__":